@@ -24,12 +24,16 @@ class DialogueBaseline:
     def _build_chain(self) -> Runnable[dict[str, Any], str]:
         return self.prompt_template | self.llm | StrOutputParser()
 
-    def process_dialogue(self, sessions: List[Session], query: str) -> str:
+    @staticmethod
+    def _build_context(sessions: List[Session]) -> str:
         context_messages = []
         for session in sessions:
             for message in session.messages:
                 context_messages.append(f"{message.role}: {message.content}")
-        context = "\n".join(context_messages)
+        return "\n".join(context_messages)
+
+    def process_dialogue(self, sessions: List[Session], query: str) -> str:
+        context = self._build_context(sessions)
         with get_openai_callback() as cb:
             result = self.chain.invoke({"context": context, "query": query})
 
@@ -37,3 +41,13 @@ class DialogueBaseline:
             self.completion_tokens += cb.completion_tokens
             self.total_cost += cb.total_cost
         return result
+
+    async def aprocess_dialogue(self, sessions: List[Session], query: str) -> str:
+        context = self._build_context(sessions)
+        with get_openai_callback() as cb:
+            result = await self.chain.ainvoke({"context": context, "query": query})
+
+            self.prompt_tokens += cb.prompt_tokens
+            self.completion_tokens += cb.completion_tokens
+            self.total_cost += cb.total_cost
+        return result
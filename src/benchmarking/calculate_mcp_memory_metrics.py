@@ -1,13 +1,13 @@
-import random
-
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any
 
+import numpy as np
+
 from src.benchmarking.llm_evaluation import LLMMemoryEvaluation
 from src.benchmarking.metric_calculator import (
     CalculateMCPMetrics,
     MCPResponseResults,
-    MetricStats,
     RawLLMData,
     RawSemanticData,
     SystemResults,
@@ -27,16 +27,15 @@ class CalculateMCPMemoryMetrics(CalculateMCPMetrics):
 
         self.semantic_scorer = SemanticSimilarity(use_tokenizer=False)
         self.llm_scorer = LLMMemoryEvaluation()
+        self._pool = ThreadPoolExecutor(max_workers=8)
 
+    def _reset_scores(self) -> None:
+        super()._reset_scores()
         self.session_count = 0
-
         self._memory_bank_semantic_data = RawSemanticData()
         self._memory_bank_llm_data = RawLLMData()
 
-    @property
-    def results(self) -> MCPResponseResults:
-        if not self._is_calculated:
-            self.calculate()
+    def _build_results(self) -> MCPResponseResults:
         return MCPResponseResults(
             metadata={
                 "timestamp": datetime.now().isoformat(),
@@ -44,60 +43,38 @@ class CalculateMCPMemoryMetrics(CalculateMCPMetrics):
                 "message_count": self.session_count,
                 "version": "1.0",
             },
-            recsum_results=SystemResults(
-                semantic_precision=MetricStats.from_values(
-                    self._recsum_semantic_data.precision
-                ),
-                semantic_recall=MetricStats.from_values(
-                    self._recsum_semantic_data.recall
-                ),
-                semantic_f1=MetricStats.from_values(self._recsum_semantic_data.f1),
-                llm_faithfulness=MetricStats.from_values(
-                    self._recsum_llm_data.faithfulness
-                ),
-                llm_informativeness=MetricStats.from_values(
-                    self._recsum_llm_data.informativeness
-                ),
-                llm_coherency=MetricStats.from_values(self._recsum_llm_data.coherency),
+            recsum_results=SystemResults.from_raw(
+                self._recsum_semantic_data, self._recsum_llm_data
             ),
-            baseline_results=SystemResults(
-                semantic_precision=MetricStats.from_values(
-                    self._memory_bank_semantic_data.precision
-                ),
-                semantic_recall=MetricStats.from_values(
-                    self._memory_bank_semantic_data.recall
-                ),
-                semantic_f1=MetricStats.from_values(self._memory_bank_semantic_data.f1),
-                llm_faithfulness=MetricStats.from_values(
-                    self._memory_bank_llm_data.faithfulness
-                ),
-                llm_informativeness=MetricStats.from_values(
-                    self._memory_bank_llm_data.informativeness
-                ),
-                llm_coherency=MetricStats.from_values(
-                    self._memory_bank_llm_data.coherency
-                ),
+            baseline_results=SystemResults.from_raw(
+                self._memory_bank_semantic_data, self._memory_bank_llm_data
             ),
             pairwise_results=self._pairwise_data,
         )
 
     def calculate(self) -> None:
+        self._reset_scores()
         dialogues = self.dataset.sessions.copy()
+        order_bits = self._draw_order_bits([len(dialogue) for dialogue in dialogues])
         for i, dialogue in enumerate(dialogues):
             print(f"Processing dialogue {i + 1}/{len(dialogues)}")
 
-            self._process_dialogue(dialogue, i)
+            self._process_dialogue(dialogue, i, order_bits[i])
 
         self._is_calculated = True
 
-    def _process_dialogue(self, dialogue: list, dialogue_index: int) -> None:
+    def _process_dialogue(
+        self, dialogue: list, dialogue_index: int, order_bits: np.ndarray
+    ) -> None:
         ideal_session_memory = self.dataset._memory[dialogue_index]
 
-        self.recsum.process_dialogue(dialogue, "")
-        self.memory_bank.process_dialogue(dialogue, "")
+        recsum_future = self._pool.submit(self.recsum.process_dialogue, dialogue, "")
+        memory_bank_future = self._pool.submit(
+            self.memory_bank.process_dialogue, dialogue, ""
+        )
 
-        recsum_state = self.recsum.state
-        memory_bank_state = self.memory_bank.state
+        recsum_state = recsum_future.result()
+        memory_bank_state = memory_bank_future.result()
 
         if not isinstance(recsum_state, RecsumDialogueState):
             raise TypeError(
@@ -111,22 +88,27 @@ class CalculateMCPMemoryMetrics(CalculateMCPMetrics):
                 f"got {type(memory_bank_state)}"
             )
 
-        for i in range(len(recsum_state.text_memory)):
+        for i, order_bit in zip(range(len(recsum_state.text_memory)), order_bits):
             recsum_memory = recsum_state.text_memory[i]
             memory_bank_memory = (
                 memory_bank_state.text_memory_storage.get_session_memory(i)
             )
             ideal_memory = ideal_session_memory[i].memory
 
+            pairwise_future = self._pool.submit(
+                self._update_llm_pairwise_scores,
+                recsum_memory,
+                memory_bank_memory,
+                ideal_memory,
+                bool(order_bit),
+            )
             self._update_semantic_scores(
                 recsum_memory, memory_bank_memory, ideal_memory
             )
             self._update_llm_single_scores(
                 recsum_memory, memory_bank_memory, ideal_memory
             )
-            self._update_llm_pairwise_scores(
-                recsum_memory, memory_bank_memory, ideal_memory
-            )
+            pairwise_future.result()
 
             self.session_count += 1
 
@@ -139,16 +121,12 @@ class CalculateMCPMemoryMetrics(CalculateMCPMetrics):
         recsum_score = self.semantic_scorer.compute_similarity(
             recsum_memory, ideal_memory
         )
-        self._recsum_semantic_data.recall.append(recsum_score.recall)
-        self._recsum_semantic_data.precision.append(recsum_score.precision)
-        self._recsum_semantic_data.f1.append(recsum_score.f1)
+        self._recsum_semantic_data.add(recsum_score)
 
         memory_bank_score = self.semantic_scorer.compute_similarity(
             memory_bank_memory, ideal_memory
         )
-        self._memory_bank_semantic_data.recall.append(memory_bank_score.recall)
-        self._memory_bank_semantic_data.precision.append(memory_bank_score.precision)
-        self._memory_bank_semantic_data.f1.append(memory_bank_score.f1)
+        self._memory_bank_semantic_data.add(memory_bank_score)
 
     def _update_llm_single_scores(
         self,
@@ -156,35 +134,28 @@ class CalculateMCPMemoryMetrics(CalculateMCPMetrics):
         memory_bank_memory: list[str],
         ideal_memory: list[str],
     ) -> None:
-        recsum_score = self.llm_scorer.evaluate_single(
+        recsum_future = self._pool.submit(
+            self.llm_scorer.evaluate_single,
             ideal_memory="\n".join(ideal_memory),
             memory="\n".join(recsum_memory),
         )
-        self._recsum_llm_data.faithfulness.append(recsum_score.faithfulness_score)
-        self._recsum_llm_data.informativeness.append(recsum_score.informativeness_score)
-        self._recsum_llm_data.coherency.append(recsum_score.coherency_score)
-
-        memory_bank_score = self.llm_scorer.evaluate_single(
+        memory_bank_future = self._pool.submit(
+            self.llm_scorer.evaluate_single,
             ideal_memory="\n".join(ideal_memory),
             memory="\n".join(memory_bank_memory),
         )
-        self._memory_bank_llm_data.faithfulness.append(
-            memory_bank_score.faithfulness_score
-        )
-        self._memory_bank_llm_data.informativeness.append(
-            memory_bank_score.informativeness_score
-        )
-        self._memory_bank_llm_data.coherency.append(memory_bank_score.coherency_score)
+
+        self._recsum_llm_data.add(recsum_future.result())
+        self._memory_bank_llm_data.add(memory_bank_future.result())
 
     def _update_llm_pairwise_scores(
         self,
         recsum_memory: list[str],
         memory_bank_memory: list[str],
         ideal_memory: list[str],
+        recsum_first: bool,
     ) -> None:
-        randomize_order = random.random() < 0.5
-
-        if randomize_order:
+        if recsum_first:
             score = self.llm_scorer.evaluate_pairwise(
                 ideal_memory="\n".join(ideal_memory),
                 first_memory="\n".join(recsum_memory),
@@ -200,10 +171,10 @@ class CalculateMCPMemoryMetrics(CalculateMCPMetrics):
             self._update_pairwise_counts(score, recsum_first=False)
 
     def print_results(self) -> None:
-        print(f"\nProcessed {self.session_count} Session\n")
-
         results = self.results
 
+        print(f"\nProcessed {self.session_count} Session\n")
+
         self._print_semantic_results(results)
 
         self._print_llm_single_results(results)
@@ -214,9 +185,6 @@ def main() -> None:
     metric_calculator = CalculateMCPMemoryMetrics(1)
 
     print("Starting MCP metrics calculation...")
-    metric_calculator.calculate()
-
-    print("Calculation completed. Results:")
     metric_calculator.print_results()
 
     saved_path = metric_calculator.save_results_to_json()
@@ -1,37 +1,52 @@
-import random
+import asyncio
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any
+from typing import Any, Awaitable, TypeVar
+
+import numpy as np
 
 from src.benchmarking.baseline import DialogueBaseline
 from src.benchmarking.llm_evaluation import LLMResponseEvaluation
 from src.benchmarking.metric_calculator import (
     CalculateMCPMetrics,
     MCPResponseResults,
-    MetricStats,
     RawLLMData,
     RawSemanticData,
     SystemResults,
 )
 from src.benchmarking.semantic_similarity import SemanticSimilarity
+from src.summarize_algorithms.core.models import Session
+
+T = TypeVar("T")
 
 
 class CalculateMCPResponseMetrics(CalculateMCPMetrics):
-    def __init__(self, *args: Any, **kwargs: Any) -> None:
+    def __init__(
+        self,
+        *args: Any,
+        concurrency: int = 8,
+        llm_concurrency: int = 8,
+        io_workers: int = 32,
+        **kwargs: Any,
+    ) -> None:
         super().__init__(*args, **kwargs)
         self.baseline = DialogueBaseline()
         self.semantic_scorer = SemanticSimilarity()
         self.llm_scorer = LLMResponseEvaluation()
 
-        self.message_count = 0
+        self.concurrency = concurrency
+        self.llm_concurrency = llm_concurrency
+        self.io_workers = io_workers
 
+    def _reset_scores(self) -> None:
+        super()._reset_scores()
+        self.message_count = 0
+        self._semantic_inputs: list[tuple[str, str, str]] = []
         self._baseline_semantic_data = RawSemanticData()
         self._baseline_llm_data = RawLLMData()
 
-    @property
-    def results(self) -> MCPResponseResults:
-        if not self._is_calculated:
-            self.calculate()
+    def _build_results(self) -> MCPResponseResults:
         return MCPResponseResults(
             metadata={
                 "timestamp": datetime.now().isoformat(),
@@ -39,141 +54,152 @@ class CalculateMCPResponseMetrics(CalculateMCPMetrics):
                 "message_count": self.message_count,
                 "version": "1.0",
             },
-            recsum_results=SystemResults(
-                semantic_precision=MetricStats.from_values(
-                    self._recsum_semantic_data.precision
-                ),
-                semantic_recall=MetricStats.from_values(
-                    self._recsum_semantic_data.recall
-                ),
-                semantic_f1=MetricStats.from_values(self._recsum_semantic_data.f1),
-                llm_faithfulness=MetricStats.from_values(
-                    self._recsum_llm_data.faithfulness
-                ),
-                llm_informativeness=MetricStats.from_values(
-                    self._recsum_llm_data.informativeness
-                ),
-                llm_coherency=MetricStats.from_values(self._recsum_llm_data.coherency),
+            recsum_results=SystemResults.from_raw(
+                self._recsum_semantic_data, self._recsum_llm_data
             ),
-            baseline_results=SystemResults(
-                semantic_precision=MetricStats.from_values(
-                    self._baseline_semantic_data.precision
-                ),
-                semantic_recall=MetricStats.from_values(
-                    self._baseline_semantic_data.recall
-                ),
-                semantic_f1=MetricStats.from_values(self._baseline_semantic_data.f1),
-                llm_faithfulness=MetricStats.from_values(
-                    self._baseline_llm_data.faithfulness
-                ),
-                llm_informativeness=MetricStats.from_values(
-                    self._baseline_llm_data.informativeness
-                ),
-                llm_coherency=MetricStats.from_values(
-                    self._baseline_llm_data.coherency
-                ),
+            baseline_results=SystemResults.from_raw(
+                self._baseline_semantic_data, self._baseline_llm_data
             ),
             pairwise_results=self._pairwise_data,
         )
 
     def calculate(self) -> None:
-        dialogues = self.dataset.sessions.copy()
-        for i, dialogue in enumerate(dialogues):
-            print(f"Processing dialogue {i + 1}/{len(dialogues)}")
+        asyncio.run(self._acalculate())
+
+    async def _acalculate(self) -> None:
+        self._reset_scores()
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=self.io_workers)
+        )
+        self._dialogue_semaphore = asyncio.Semaphore(self.concurrency)
+        self._llm_semaphore = asyncio.Semaphore(self.llm_concurrency)
 
-            self._process_dialogue(dialogue, i)
+        dialogues = self.dataset.sessions.copy()
+        order_bits = self._draw_order_bits(
+            [len(dialogue[-1].messages) - 1 for dialogue in dialogues]
+        )
+        tasks = [
+            self._aprocess_dialogue(dialogue, i, order_bits[i])
+            for i, dialogue in enumerate(dialogues)
+        ]
+        for done, task in enumerate(asyncio.as_completed(tasks), start=1):
+            await task
+            print(f"Processed dialogue {done}/{len(dialogues)}")
+
+        await self._update_semantic_scores()
         self._is_calculated = True
 
-    def _process_dialogue(self, dialogue: list, dialogue_index: int) -> None:
-        ideal_response = dialogue[-1].messages.pop()
+    async def _limited(self, coroutine: Awaitable[T]) -> T:
+        async with self._llm_semaphore:
+            return await coroutine
 
-        while dialogue[-1].messages:
-            self.message_count += 1
-            query = dialogue[-1].messages.pop()
+    async def _aprocess_dialogue(
+        self, dialogue: list[Session], dialogue_index: int, order_bits: np.ndarray
+    ) -> None:
+        async with self._dialogue_semaphore:
+            await self._aprocess_messages(dialogue, dialogue_index, order_bits)
 
-            recsum_response = self.recsum.process_dialogue(
-                dialogue, query.content
-            ).response
-            baseline_response = self.baseline.process_dialogue(dialogue, query.content)
+    async def _aprocess_messages(
+        self, dialogue: list[Session], dialogue_index: int, order_bits: np.ndarray
+    ) -> None:
+        messages = dialogue[-1].messages
+        ideal_response = messages[-1]
+        memory = "\n".join(self.dataset.memory[dialogue_index][-1].memory)
+
+        comparisons = []
+        for query_index, order_bit in zip(
+            reversed(range(len(messages) - 1)), order_bits
+        ):
+            self.message_count += 1
+            query = messages[query_index]
+            sessions = dialogue[:-1] + [Session(messages[:query_index])]
 
-            self._update_semantic_scores(
-                recsum_response, baseline_response, ideal_response.content
+            recsum_state, baseline_response = await asyncio.gather(
+                self._limited(self.recsum.aprocess_dialogue(sessions, query.content)),
+                self._limited(self.baseline.aprocess_dialogue(sessions, query.content)),
             )
+            recsum_response = recsum_state.response
 
-            context = str(dialogue[-1])
-            memory_session = self.dataset.memory[dialogue_index][-1].memory
-            memory = "\n".join(memory_session)
+            context = str(sessions[-1])
 
-            self._update_llm_single_scores(
-                recsum_response, baseline_response, context, memory
+            self._semantic_inputs.append(
+                (recsum_response, baseline_response, ideal_response.content)
             )
-            self._update_llm_pairwise_scores(
-                context, memory, recsum_response, baseline_response
+            comparisons.append(
+                (context, memory, recsum_response, baseline_response, bool(order_bit))
             )
 
-    def _update_semantic_scores(
-        self, recsum_response: str, baseline_response: str, ideal_response: str
-    ) -> None:
-        recsum_score = self.semantic_scorer.compute_similarity(
-            recsum_response, ideal_response
-        )
-        self._recsum_semantic_data.recall.append(recsum_score.recall)
-        self._recsum_semantic_data.precision.append(recsum_score.precision)
-        self._recsum_semantic_data.f1.append(recsum_score.f1)
+            await self._update_llm_single_scores(
+                recsum_response, baseline_response, context, memory
+            )
+
+        await self._update_llm_pairwise_scores(comparisons)
+
+    async def _update_semantic_scores(self) -> None:
+        recsum_pairs = [(recsum, ideal) for recsum, _, ideal in self._semantic_inputs]
+        baseline_pairs = [
+            (baseline, ideal) for _, baseline, ideal in self._semantic_inputs
+        ]
 
-        baseline_score = self.semantic_scorer.compute_similarity(
-            baseline_response, ideal_response
+        scores = await self.semantic_scorer.acompute_similarity_batch(
+            recsum_pairs + baseline_pairs
         )
-        self._baseline_semantic_data.recall.append(baseline_score.recall)
-        self._baseline_semantic_data.precision.append(baseline_score.precision)
-        self._baseline_semantic_data.f1.append(baseline_score.f1)
 
-    def _update_llm_single_scores(
+        self._recsum_semantic_data.extend(scores[: len(recsum_pairs)])
+        self._baseline_semantic_data.extend(scores[len(recsum_pairs) :])
+
+        self._semantic_inputs.clear()
+
+    async def _update_llm_single_scores(
         self, recsum_response: str, baseline_response: str, context: str, memory: str
     ) -> None:
-        recsum_score = self.llm_scorer.evaluate_single(
-            context=context, memory=memory, response=recsum_response
-        )
-        self._recsum_llm_data.faithfulness.append(recsum_score.faithfulness_score)
-        self._recsum_llm_data.informativeness.append(recsum_score.informativeness_score)
-        self._recsum_llm_data.coherency.append(recsum_score.coherency_score)
-
-        baseline_score = self.llm_scorer.evaluate_single(
-            context=context, memory=memory, response=baseline_response
-        )
-        self._baseline_llm_data.faithfulness.append(baseline_score.faithfulness_score)
-        self._baseline_llm_data.informativeness.append(
-            baseline_score.informativeness_score
+        recsum_score, baseline_score = await asyncio.gather(
+            self._limited(
+                self.llm_scorer.aevaluate_single(
+                    context=context, memory=memory, response=recsum_response
+                )
+            ),
+            self._limited(
+                self.llm_scorer.aevaluate_single(
+                    context=context, memory=memory, response=baseline_response
+                )
+            ),
         )
-        self._baseline_llm_data.coherency.append(baseline_score.coherency_score)
+        self._recsum_llm_data.add(recsum_score)
+        self._baseline_llm_data.add(baseline_score)
 
-    def _update_llm_pairwise_scores(
-        self, context: str, memory: str, recsum_response: str, baseline_response: str
+    async def _update_llm_pairwise_scores(
+        self, comparisons: list[tuple[str, str, str, str, bool]]
     ) -> None:
-        randomize_order = random.random() < 0.5
-
-        if randomize_order:
-            score = self.llm_scorer.evaluate_pairwise(
-                context=context,
-                memory=memory,
-                first_response=recsum_response,
-                second_response=baseline_response,
-            )
-            self._update_pairwise_counts(score, recsum_first=True)
-        else:
-            score = self.llm_scorer.evaluate_pairwise(
-                context=context,
-                memory=memory,
-                first_response=baseline_response,
-                second_response=recsum_response,
+        ordered_comparisons = [
+            (context, memory, recsum, baseline)
+            if recsum_first
+            else (context, memory, baseline, recsum)
+            for context, memory, recsum, baseline, recsum_first in comparisons
+        ]
+        scores = await asyncio.gather(
+            *(
+                self._limited(
+                    self.llm_scorer.aevaluate_pairwise(
+                        context=context,
+                        memory=memory,
+                        first_response=first_response,
+                        second_response=second_response,
+                    )
+                )
+                for context, memory, first_response, second_response in (
+                    ordered_comparisons
+                )
             )
-            self._update_pairwise_counts(score, recsum_first=False)
+        )
+        for score, (*_, recsum_first) in zip(scores, comparisons):
+            self._update_pairwise_counts(score, recsum_first)
 
     def print_results(self) -> None:
-        print(f"\nProcessed {self.message_count} messages\n")
-
         results = self.results
 
+        print(f"\nProcessed {self.message_count} messages\n")
+
         self._print_semantic_results(results)
 
         self._print_llm_single_results(results)
@@ -184,9 +210,6 @@ def main() -> None:
     metric_calculator = CalculateMCPResponseMetrics()
 
     print("Starting MCP metrics calculation...")
-    metric_calculator.calculate()
-
-    print("Calculation completed. Results:")
     metric_calculator.print_results()
 
     saved_path = metric_calculator.save_results_to_json()
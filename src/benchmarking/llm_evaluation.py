@@ -1,7 +1,11 @@
+import hashlib
+import json
+
 from abc import ABC, abstractmethod
 from enum import Enum
 from typing import Any, Generic, Optional, TypeVar
 
+from diskcache import Cache
 from langchain_core.language_models import BaseChatModel
 from langchain_core.prompts import PromptTemplate
 from langchain_core.runnables import RunnableSerializable
@@ -78,8 +82,13 @@ PairwiseResultType = TypeVar("PairwiseResultType", bound=BaseModel)
 
 
 class BaseLLMEvaluation(Generic[SingleResultType, PairwiseResultType], ABC):
-    def __init__(self, llm: Optional[BaseChatModel] = None) -> None:
+    def __init__(
+        self,
+        llm: Optional[BaseChatModel] = None,
+        cache_dir: Optional[str] = ".llm_cache",
+    ) -> None:
         self.llm = llm or ChatOpenAI(model=OpenAIModels.GPT_4_1.value, temperature=0.0)
+        self.cache = Cache(cache_dir) if cache_dir is not None else None
         self.single_eval_prompt = self._get_single_eval_prompt()
         self.pairwise_eval_prompt = self._get_pairwise_eval_prompt()
         self.single_eval_chain = self._build_single_eval_chain()
@@ -118,6 +127,103 @@ class BaseLLMEvaluation(Generic[SingleResultType, PairwiseResultType], ABC):
         except Exception as e:
             raise ConnectionError(f"API request failed: {e}") from e
 
+    @staticmethod
+    async def _safe_ainvoke(chain: RunnableSerializable, params: dict[str, str]) -> Any:
+        try:
+            return await chain.ainvoke(params)
+        except Exception as e:
+            raise ConnectionError(f"API request failed: {e}") from e
+
+    def _cache_key(
+        self,
+        prompt: PromptTemplate,
+        result_model: type[BaseModel],
+        params: dict[str, str],
+    ) -> str:
+        payload = json.dumps(
+            {
+                "evaluation": type(self).__name__,
+                "prompt": prompt.template,
+                "result": result_model.__name__,
+                "model": getattr(self.llm, "model_name", type(self.llm).__name__),
+                "temperature": getattr(self.llm, "temperature", None),
+                "params": params,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.blake2b(payload.encode()).hexdigest()
+
+    def _cache_get(self, key: str, result_model: type[BaseModel]) -> Any:
+        if self.cache is None:
+            return None
+        cached = self.cache.get(key)
+        return result_model.model_validate_json(cached) if cached is not None else None
+
+    def _cache_set(self, key: str, result: BaseModel) -> None:
+        if self.cache is not None:
+            self.cache.set(key, result.model_dump_json())
+
+    def _cached_invoke(
+        self,
+        chain: RunnableSerializable,
+        prompt: PromptTemplate,
+        result_model: type[BaseModel],
+        params: dict[str, str],
+    ) -> Any:
+        key = self._cache_key(prompt, result_model, params)
+        result = self._cache_get(key, result_model)
+        if result is None:
+            result = self._safe_invoke(chain, params)
+            self._cache_set(key, result)
+        return result
+
+    async def _cached_ainvoke(
+        self,
+        chain: RunnableSerializable,
+        prompt: PromptTemplate,
+        result_model: type[BaseModel],
+        params: dict[str, str],
+    ) -> Any:
+        key = self._cache_key(prompt, result_model, params)
+        result = self._cache_get(key, result_model)
+        if result is None:
+            result = await self._safe_ainvoke(chain, params)
+            self._cache_set(key, result)
+        return result
+
+    def _invoke_single(self, params: dict[str, str]) -> SingleResultType:
+        return self._cached_invoke(
+            self.single_eval_chain,
+            self.single_eval_prompt,
+            self._get_single_result_model(),
+            params,
+        )
+
+    def _invoke_pairwise(self, params: dict[str, str]) -> PairwiseResultType:
+        return self._cached_invoke(
+            self.pairwise_eval_chain,
+            self.pairwise_eval_prompt,
+            self._get_pairwise_result_model(),
+            params,
+        )
+
+    async def _ainvoke_single(self, params: dict[str, str]) -> SingleResultType:
+        return await self._cached_ainvoke(
+            self.single_eval_chain,
+            self.single_eval_prompt,
+            self._get_single_result_model(),
+            params,
+        )
+
+    async def _ainvoke_pairwise(self, params: dict[str, str]) -> PairwiseResultType:
+        return await self._cached_ainvoke(
+            self.pairwise_eval_chain,
+            self.pairwise_eval_prompt,
+            self._get_pairwise_result_model(),
+            params,
+        )
+
 
 class LLMResponseEvaluation(BaseLLMEvaluation[SingleResult, PairwiseResult]):
     def _get_single_eval_prompt(self) -> PromptTemplate:
@@ -134,7 +240,7 @@ class LLMResponseEvaluation(BaseLLMEvaluation[SingleResult, PairwiseResult]):
 
     def evaluate_single(self, context: str, memory: str, response: str) -> SingleResult:
         params = {"context": context, "memory": memory, "response": response}
-        return self._safe_invoke(self.single_eval_chain, params)
+        return self._invoke_single(params)
 
     def evaluate_pairwise(
         self, context: str, memory: str, first_response: str, second_response: str
@@ -145,7 +251,24 @@ class LLMResponseEvaluation(BaseLLMEvaluation[SingleResult, PairwiseResult]):
             "first_response": first_response,
             "second_response": second_response,
         }
-        return self._safe_invoke(self.pairwise_eval_chain, params)
+        return self._invoke_pairwise(params)
+
+    async def aevaluate_single(
+        self, context: str, memory: str, response: str
+    ) -> SingleResult:
+        params = {"context": context, "memory": memory, "response": response}
+        return await self._ainvoke_single(params)
+
+    async def aevaluate_pairwise(
+        self, context: str, memory: str, first_response: str, second_response: str
+    ) -> PairwiseResult:
+        params = {
+            "context": context,
+            "memory": memory,
+            "first_response": first_response,
+            "second_response": second_response,
+        }
+        return await self._ainvoke_pairwise(params)
 
 
 class LLMMemoryEvaluation(BaseLLMEvaluation[SingleResult, PairwiseResult]):
@@ -163,7 +286,7 @@ class LLMMemoryEvaluation(BaseLLMEvaluation[SingleResult, PairwiseResult]):
 
     def evaluate_single(self, ideal_memory: str, memory: str) -> SingleResult:
         params = {"generated_memory": memory, "ideal_memory": ideal_memory}
-        return self._safe_invoke(self.single_eval_chain, params)
+        return self._invoke_single(params)
 
     def evaluate_pairwise(
         self, ideal_memory: str, first_memory: str, second_memory: str
@@ -173,7 +296,7 @@ class LLMMemoryEvaluation(BaseLLMEvaluation[SingleResult, PairwiseResult]):
             "second_memory": second_memory,
             "ideal_memory": ideal_memory,
         }
-        return self._safe_invoke(self.pairwise_eval_chain, params)
+        return self._invoke_pairwise(params)
 
 
 class LLMChatAgentEvaluation(
@@ -198,7 +321,7 @@ class LLMChatAgentEvaluation(
             "dialogue_context": dialogue_context,
             "assistant_answer": assistant_answer,
         }
-        return self._safe_invoke(self.single_eval_chain, params)
+        return self._invoke_single(params)
 
     def evaluate_pairwise(
         self, dialogue_context: str, first_answer: str, second_answer: str
@@ -208,4 +331,4 @@ class LLMChatAgentEvaluation(
             "first_answer": first_answer,
             "second_answer": second_answer,
         }
-        return self._safe_invoke(self.pairwise_eval_chain, params)
+        return self._invoke_pairwise(params)
@@ -1,35 +1,105 @@
 import abc
 import json
+import sys
 
-from dataclasses import asdict, dataclass, field
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List, Optional, Sequence
 
 import numpy as np
 
 from pydantic import BaseModel
 
 from src.benchmarking.deserialize_mcp_data import MCPDataset
-from src.benchmarking.llm_evaluation import ComparisonResult
+from src.benchmarking.llm_evaluation import ComparisonResult, SingleResult
+from src.benchmarking.semantic_similarity import SemanticSimilarityResult
 from src.summarize_algorithms.recsum.dialogue_system import RecsumDialogueSystem
 
+REPORT_SEPARATOR = "=" * 50
+SEMANTIC_REPORT_ROW = (
+    "{name:<10}- Precision: {results.semantic_precision.mean:.4f}"
+    " (±{results.semantic_precision.std:.4f}), "
+    "Recall: {results.semantic_recall.mean:.4f}"
+    " (±{results.semantic_recall.std:.4f}), "
+    "F1: {results.semantic_f1.mean:.4f}"
+    " (±{results.semantic_f1.std:.4f})"
+)
+LLM_SINGLE_REPORT_ROW = (
+    "{name:<10}- Faithfulness: {results.llm_faithfulness.mean:.2f}"
+    " (±{results.llm_faithfulness.std:.2f}), "
+    "Informativeness: {results.llm_informativeness.mean:.2f}"
+    " (±{results.llm_informativeness.std:.2f}), "
+    "Coherency: {results.llm_coherency.mean:.2f}"
+    " (±{results.llm_coherency.std:.2f})"
+)
+LLM_PAIRWISE_REPORT_ROW = (
+    "{metric:<15}: RecSum {recsum}/{total} ({recsum_share:.1f}%), "
+    "Baseline {baseline}/{total} ({baseline_share:.1f}%), "
+    "Draws {draw}/{total} ({draw_share:.1f}%)"
+)
+
+
+class ScoreBuffer:
+    __slots__ = ("_data", "_size")
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._data = np.empty(capacity, dtype=np.float64)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
 
-@dataclass
+    @property
+    def values(self) -> np.ndarray:
+        return self._data[: self._size]
+
+    def _reserve(self, size: int) -> None:
+        if size > len(self._data):
+            self._data = np.resize(self._data, max(size, 2 * len(self._data)))
+
+    def append(self, value: float) -> None:
+        self._reserve(self._size + 1)
+        self._data[self._size] = value
+        self._size += 1
+
+    def extend(self, values: Iterable[float]) -> None:
+        new_values = np.fromiter(values, dtype=np.float64)
+        self._reserve(self._size + len(new_values))
+        self._data[self._size : self._size + len(new_values)] = new_values
+        self._size += len(new_values)
+
+
+@dataclass(slots=True)
 class RawSemanticData:
-    precision: List[float] = field(default_factory=list)
-    recall: List[float] = field(default_factory=list)
-    f1: List[float] = field(default_factory=list)
+    precision: ScoreBuffer = field(default_factory=ScoreBuffer)
+    recall: ScoreBuffer = field(default_factory=ScoreBuffer)
+    f1: ScoreBuffer = field(default_factory=ScoreBuffer)
+
+    def add(self, score: SemanticSimilarityResult) -> None:
+        self.precision.append(score.precision)
+        self.recall.append(score.recall)
+        self.f1.append(score.f1)
 
+    def extend(self, scores: Sequence[SemanticSimilarityResult]) -> None:
+        self.precision.extend(score.precision for score in scores)
+        self.recall.extend(score.recall for score in scores)
+        self.f1.extend(score.f1 for score in scores)
 
-@dataclass
+
+@dataclass(slots=True)
 class RawLLMData:
-    faithfulness: List[float] = field(default_factory=list)
-    informativeness: List[float] = field(default_factory=list)
-    coherency: List[float] = field(default_factory=list)
+    faithfulness: ScoreBuffer = field(default_factory=ScoreBuffer)
+    informativeness: ScoreBuffer = field(default_factory=ScoreBuffer)
+    coherency: ScoreBuffer = field(default_factory=ScoreBuffer)
+
+    def add(self, score: SingleResult) -> None:
+        self.faithfulness.append(score.faithfulness_score)
+        self.informativeness.append(score.informativeness_score)
+        self.coherency.append(score.coherency_score)
 
 
-@dataclass
+@dataclass(slots=True)
 class MetricStats:
     mean: float = 0.0
     std: float = 0.0
@@ -37,22 +107,52 @@ class MetricStats:
     max: float = 0.0
     count: int = 0
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "mean": self.mean,
+            "std": self.std,
+            "min": self.min,
+            "max": self.max,
+            "count": self.count,
+        }
+
     @classmethod
-    def from_values(cls, values: List[float]) -> "MetricStats":
-        if not values:
+    def from_values(cls, values: np.ndarray) -> "MetricStats":
+        if len(values) == 0:
             return cls()
 
-        np_values = np.array(values)
         return cls(
-            mean=float(np.mean(np_values)),
-            std=float(np.std(np_values)),
-            min=float(np.min(np_values)),
-            max=float(np.max(np_values)),
+            mean=float(values.mean()),
+            std=float(values.std()),
+            min=float(values.min()),
+            max=float(values.max()),
             count=len(values),
         )
 
+    @classmethod
+    def from_matrix(cls, values: np.ndarray) -> List["MetricStats"]:
+        n_metrics, count = values.shape
+        if count == 0:
+            return [cls() for _ in range(n_metrics)]
+
+        return [
+            cls(
+                mean=float(mean),
+                std=float(std),
+                min=float(min_),
+                max=float(max_),
+                count=count,
+            )
+            for mean, std, min_, max_ in zip(
+                values.mean(axis=1),
+                values.std(axis=1),
+                values.min(axis=1),
+                values.max(axis=1),
+            )
+        ]
+
 
-@dataclass
+@dataclass(slots=True)
 class SystemResults:
     semantic_precision: MetricStats = field(default_factory=MetricStats)
     semantic_recall: MetricStats = field(default_factory=MetricStats)
@@ -62,8 +162,44 @@ class SystemResults:
     llm_informativeness: MetricStats = field(default_factory=MetricStats)
     llm_coherency: MetricStats = field(default_factory=MetricStats)
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "semantic_precision": self.semantic_precision.to_dict(),
+            "semantic_recall": self.semantic_recall.to_dict(),
+            "semantic_f1": self.semantic_f1.to_dict(),
+            "llm_faithfulness": self.llm_faithfulness.to_dict(),
+            "llm_informativeness": self.llm_informativeness.to_dict(),
+            "llm_coherency": self.llm_coherency.to_dict(),
+        }
+
+    @classmethod
+    def from_raw(
+        cls, semantic_data: RawSemanticData, llm_data: RawLLMData
+    ) -> "SystemResults":
+        values = np.stack(
+            [
+                semantic_data.precision.values,
+                semantic_data.recall.values,
+                semantic_data.f1.values,
+                llm_data.faithfulness.values,
+                llm_data.informativeness.values,
+                llm_data.coherency.values,
+            ]
+        )
+        precision, recall, f1, faithfulness, informativeness, coherency = (
+            MetricStats.from_matrix(values)
+        )
+        return cls(
+            semantic_precision=precision,
+            semantic_recall=recall,
+            semantic_f1=f1,
+            llm_faithfulness=faithfulness,
+            llm_informativeness=informativeness,
+            llm_coherency=coherency,
+        )
+
 
-@dataclass
+@dataclass(slots=True)
 class PairwiseResults:
     faithfulness: Dict[str, int] = field(
         default_factory=lambda: {"recsum": 0, "baseline": 0, "draw": 0}
@@ -78,64 +214,111 @@ class PairwiseResults:
     def get_total_count(self) -> int:
         return sum(self.faithfulness.values())
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "faithfulness": dict(self.faithfulness),
+            "informativeness": dict(self.informativeness),
+            "coherency": dict(self.coherency),
+        }
+
 
-@dataclass
+@dataclass(slots=True)
 class MCPResult:
     metadata: Dict[str, Any] = field(default_factory=dict)
     recsum_results: SystemResults = field(default_factory=SystemResults)
     pairwise_results: PairwiseResults = field(default_factory=PairwiseResults)
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "metadata": dict(self.metadata),
+            "recsum_results": self.recsum_results.to_dict(),
+            "pairwise_results": self.pairwise_results.to_dict(),
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class MCPResponseResults(MCPResult):
     baseline_results: SystemResults = field(default_factory=SystemResults)
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **MCPResult.to_dict(self),
+            "baseline_results": self.baseline_results.to_dict(),
+        }
+
 
-@dataclass
+@dataclass(slots=True)
 class MCPMemoryResults(MCPResult):
     memory_bank_results: SystemResults = field(default_factory=SystemResults)
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **MCPResult.to_dict(self),
+            "memory_bank_results": self.memory_bank_results.to_dict(),
+        }
+
 
 class CalculateMCPMetrics(abc.ABC):
-    def __init__(self, n_samples: int = 30):
+    PAIRWISE_METRICS = ("faithfulness", "informativeness", "coherency")
+    RECSUM_FIRST_WINNERS = {
+        ComparisonResult.OPTION_1_BETTER: "recsum",
+        ComparisonResult.OPTION_2_BETTER: "baseline",
+        ComparisonResult.DRAW: "draw",
+    }
+    RECSUM_SECOND_WINNERS = {
+        ComparisonResult.OPTION_1_BETTER: "baseline",
+        ComparisonResult.OPTION_2_BETTER: "recsum",
+        ComparisonResult.DRAW: "draw",
+    }
+
+    def __init__(self, n_samples: int = 30, seed: Optional[int] = None):
         self.dataset = MCPDataset(n_samples)
         self.recsum = RecsumDialogueSystem()
 
+        self.n_samples = n_samples
+        self._rng = np.random.default_rng(seed)
+
+        self._results: Optional[MCPResponseResults] = None
+        self._reset_scores()
+
+    @property
+    def results(self) -> MCPResponseResults:
+        if not self._is_calculated:
+            self.calculate()
+        if self._results is None:
+            self._results = self._build_results()
+        return self._results
+
+    def _reset_scores(self) -> None:
         self._recsum_semantic_data = RawSemanticData()
         self._recsum_llm_data = RawLLMData()
         self._pairwise_data = PairwiseResults()
-
-        self.n_samples = n_samples
+        self._pairwise_dicts = tuple(
+            getattr(self._pairwise_data, metric) for metric in self.PAIRWISE_METRICS
+        )
 
         self._is_calculated = False
+        self._results = None
 
-    @property
     @abc.abstractmethod
-    def results(self) -> MCPResponseResults:
+    def _build_results(self) -> MCPResponseResults:
         pass
 
     @abc.abstractmethod
     def calculate(self) -> None:
         pass
 
-    def _update_pairwise_counts(self, score: BaseModel, recsum_first: bool) -> None:
-        metrics = ["faithfulness", "informativeness", "coherency"]
+    def _draw_order_bits(self, counts: List[int]) -> List[np.ndarray]:
+        order_bits = self._rng.integers(0, 2, size=sum(counts), dtype=np.uint8)
+        return np.split(order_bits, np.cumsum(counts)[:-1])
 
-        for metric in metrics:
-            score_value = getattr(score, metric)
-            result_dict = getattr(self._pairwise_data, metric)
+    def _update_pairwise_counts(self, score: BaseModel, recsum_first: bool) -> None:
+        winners = (
+            self.RECSUM_FIRST_WINNERS if recsum_first else self.RECSUM_SECOND_WINNERS
+        )
 
-            if score_value == ComparisonResult.OPTION_1_BETTER:
-                winner = "recsum" if recsum_first else "baseline"
-                result_dict[winner] += 1
-            elif score_value == ComparisonResult.OPTION_2_BETTER:
-                winner = "baseline" if recsum_first else "recsum"
-                result_dict[winner] += 1
-            else:
-                result_dict["draw"] += 1
+        for result_dict, metric in zip(self._pairwise_dicts, self.PAIRWISE_METRICS):
+            result_dict[winners[getattr(score, metric)]] += 1
 
     def save_results_to_json(self, filepath: str = None) -> str:
         if filepath is None:
@@ -144,78 +327,67 @@ class CalculateMCPMetrics(abc.ABC):
 
         Path(filepath).parent.mkdir(parents=True, exist_ok=True)
 
-        results_dict = self.results.to_dict()
-
         with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(results_dict, f, indent=2, ensure_ascii=False)
+            json.dump(self.results.to_dict(), f, indent=2, ensure_ascii=False)
 
         return filepath
 
+    @staticmethod
+    def _write_report(lines: List[str]) -> None:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+    @staticmethod
+    def _report_header(title: str) -> List[str]:
+        return [REPORT_SEPARATOR, title, REPORT_SEPARATOR]
+
     def _print_semantic_results(self, results: MCPResponseResults) -> None:
-        print("=" * 50)
-        print("SEMANTIC EVALUATION RESULTS")
-        print("=" * 50)
-        print(
-            f"RecSum    - Precision: {results.recsum_results.semantic_precision.mean:.4f}"
-            f" (±{results.recsum_results.semantic_precision.std:.4f}), "
-            f"Recall: {results.recsum_results.semantic_recall.mean:.4f}"
-            f" (±{results.recsum_results.semantic_recall.std:.4f}), "
-            f"F1: {results.recsum_results.semantic_f1.mean:.4f}"
-            f" (±{results.recsum_results.semantic_f1.std:.4f})"
+        self._write_report(
+            [
+                *self._report_header("SEMANTIC EVALUATION RESULTS"),
+                SEMANTIC_REPORT_ROW.format(
+                    name="RecSum", results=results.recsum_results
+                ),
+                SEMANTIC_REPORT_ROW.format(
+                    name="Baseline", results=results.baseline_results
+                ),
+                "",
+            ]
         )
-        print(
-            f"Baseline  - Precision: {results.baseline_results.semantic_precision.mean:.4f}"
-            f" (±{results.baseline_results.semantic_precision.std:.4f}), "
-            f"Recall: {results.baseline_results.semantic_recall.mean:.4f}"
-            f" (±{results.baseline_results.semantic_recall.std:.4f}), "
-            f"F1: {results.baseline_results.semantic_f1.mean:.4f}"
-            f" (±{results.baseline_results.semantic_f1.std:.4f})"
-        )
-        print()
 
     def _print_llm_single_results(self, results: MCPResponseResults) -> None:
-        print("=" * 50)
-        print("LLM SINGLE EVALUATION RESULTS")
-        print("=" * 50)
-        print(
-            f"RecSum    - Faithfulness: {results.recsum_results.llm_faithfulness.mean:.2f}"
-            f" (±{results.recsum_results.llm_faithfulness.std:.2f}), "
-            f"Informativeness: {results.recsum_results.llm_informativeness.mean:.2f}"
-            f" (±{results.recsum_results.llm_informativeness.std:.2f}), "
-            f"Coherency: {results.recsum_results.llm_coherency.mean:.2f}"
-            f" (±{results.recsum_results.llm_coherency.std:.2f})"
-        )
-        print(
-            f"Baseline  - Faithfulness: {results.baseline_results.llm_faithfulness.mean:.2f}"
-            f" (±{results.baseline_results.llm_faithfulness.std:.2f}), "
-            f"Informativeness: {results.baseline_results.llm_informativeness.mean:.2f}"
-            f" (±{results.baseline_results.llm_informativeness.std:.2f}), "
-            f"Coherency: {results.baseline_results.llm_coherency.mean:.2f}"
-            f" (±{results.baseline_results.llm_coherency.std:.2f})"
+        self._write_report(
+            [
+                *self._report_header("LLM SINGLE EVALUATION RESULTS"),
+                LLM_SINGLE_REPORT_ROW.format(
+                    name="RecSum", results=results.recsum_results
+                ),
+                LLM_SINGLE_REPORT_ROW.format(
+                    name="Baseline", results=results.baseline_results
+                ),
+                "",
+            ]
         )
-        print()
 
     def _print_llm_pairwise_results(self, results: MCPResponseResults) -> None:
         total_count = results.pairwise_results.get_total_count()
 
         if total_count == 0:
-            print("No pairwise evaluations completed.")
+            self._write_report(["No pairwise evaluations completed."])
             return
 
-        print("=" * 50)
-        print("LLM PAIRWISE EVALUATION RESULTS")
-        print("=" * 50)
-
-        metrics = ["faithfulness", "informativeness", "coherency"]
-        for metric in metrics:
+        lines = self._report_header("LLM PAIRWISE EVALUATION RESULTS")
+        for metric in self.PAIRWISE_METRICS:
             result_dict = getattr(results.pairwise_results, metric)
-            recsum_wins = result_dict["recsum"]
-            baseline_wins = result_dict["baseline"]
-            draws = result_dict["draw"]
-
-            print(
-                f"{metric.capitalize():<15}: RecSum {recsum_wins}/{total_count}"
-                f" ({recsum_wins / total_count * 100:.1f}%), "
-                f"Baseline {baseline_wins}/{total_count} ({baseline_wins / total_count * 100:.1f}%), "
-                f"Draws {draws}/{total_count} ({draws / total_count * 100:.1f}%)"
+            lines.append(
+                LLM_PAIRWISE_REPORT_ROW.format(
+                    metric=metric.capitalize(),
+                    total=total_count,
+                    recsum=result_dict["recsum"],
+                    baseline=result_dict["baseline"],
+                    draw=result_dict["draw"],
+                    recsum_share=result_dict["recsum"] / total_count * 100,
+                    baseline_share=result_dict["baseline"] / total_count * 100,
+                    draw_share=result_dict["draw"] / total_count * 100,
+                )
             )
+        self._write_report(lines)
@@ -1,3 +1,5 @@
+import asyncio
+
 from dataclasses import dataclass
 from typing import Any
 
@@ -5,7 +7,6 @@ import numpy as np
 import tiktoken
 
 from langchain_openai import OpenAIEmbeddings
-from sklearn.metrics.pairwise import cosine_similarity
 
 
 @dataclass
@@ -21,11 +22,14 @@ class SemanticSimilarity:
         model: str = "text-embedding-3-small",
         batch_size: int = 100,
         use_tokenizer: bool = True,
+        cache_size: int = 4096,
     ) -> None:
         self.embeddings = OpenAIEmbeddings(model=model, chunk_size=batch_size)
         self.batch_size = batch_size
         self.tokenizer = tiktoken.get_encoding("cl100k_base")
         self.use_tokenizer = use_tokenizer
+        self.cache_size = cache_size
+        self._embedding_cache: dict[str, np.ndarray] = {}
 
     def _tokenize(self, text: str) -> np.ndarray:
         if not text or not text.strip():
@@ -43,25 +47,104 @@ class SemanticSimilarity:
         non_empty_mask = np.vectorize(lambda x: bool(x))(tokens)
         return tokens[non_empty_mask]
 
+    def _lookup_cached(self, tokens: list[str]) -> dict[str, np.ndarray]:
+        return {
+            token: self._embedding_cache[token]
+            for token in tokens
+            if token in self._embedding_cache
+        }
+
+    @staticmethod
+    def _normalize_vectors(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms = np.where(norms == 0, 1, norms)
+        return vectors / norms
+
+    def _merge_cached(
+        self,
+        tokens: list[str],
+        cached: dict[str, np.ndarray],
+        missing: list[str],
+        embeddings: list[list[float]],
+    ) -> np.ndarray:
+        fresh = (
+            dict(
+                zip(
+                    missing,
+                    self._normalize_vectors(np.array(embeddings, dtype=np.float32)),
+                )
+            )
+            if missing
+            else {}
+        )
+        embeddings_array = np.array(
+            [fresh[token] if token in fresh else cached[token] for token in tokens],
+            dtype=np.float32,
+        )
+
+        self._embedding_cache.update(fresh)
+        while len(self._embedding_cache) > self.cache_size:
+            del self._embedding_cache[next(iter(self._embedding_cache))]
+
+        return embeddings_array
+
+    def _embed_unique(self, tokens: list[str]) -> np.ndarray:
+        cached = self._lookup_cached(tokens)
+        missing = [token for token in tokens if token not in cached]
+        embeddings = self.embeddings.embed_documents(missing) if missing else []
+        return self._merge_cached(tokens, cached, missing, embeddings)
+
+    async def _aembed_unique(self, tokens: list[str]) -> np.ndarray:
+        cached = self._lookup_cached(tokens)
+        missing = [token for token in tokens if token not in cached]
+        embeddings = await self.embeddings.aembed_documents(missing) if missing else []
+        return self._merge_cached(tokens, cached, missing, embeddings)
+
     def _get_embeddings_batch(self, tokens: np.ndarray) -> np.ndarray:
         unique_tokens, inverse_indices = np.unique(tokens, return_inverse=True)
 
-        embeddings_list = self.embeddings.embed_documents(unique_tokens.tolist())
-        embeddings_array = np.array(embeddings_list)
+        embeddings_array = self._embed_unique(unique_tokens.tolist())
+
+        return embeddings_array[inverse_indices]
+
+    async def _aget_embeddings_batch(self, tokens: np.ndarray) -> np.ndarray:
+        unique_tokens, inverse_indices = np.unique(tokens, return_inverse=True)
+
+        embeddings_array = await self._aembed_unique(unique_tokens.tolist())
 
         return embeddings_array[inverse_indices]
 
+    def _split(self, text: Any) -> np.ndarray:
+        if self.use_tokenizer:
+            return self._tokenize(text)
+        return np.array([text]).ravel()
+
+    @staticmethod
+    def _score(
+        cand_embeddings: np.ndarray, ref_embeddings: np.ndarray
+    ) -> SemanticSimilarityResult:
+        sim_matrix = cand_embeddings @ ref_embeddings.T
+
+        precisions = np.max(sim_matrix, axis=1)
+        recalls = np.max(sim_matrix, axis=0)
+
+        precision = np.mean(precisions)
+        recall = np.mean(recalls)
+
+        denominator = precision + recall
+        f1 = 2 * precision * recall / denominator if denominator != 0 else 0.0
+
+        return SemanticSimilarityResult(
+            precision=float(precision), recall=float(recall), f1=float(f1)
+        )
+
     def compute_similarity(
         self, candidate: Any, reference: Any
     ) -> SemanticSimilarityResult:
         if not candidate or not reference:
             return SemanticSimilarityResult(0.0, 0.0, 0.0)
-        if self.use_tokenizer:
-            cand_tokens = self._tokenize(candidate)
-            ref_tokens = self._tokenize(reference)
-        else:
-            cand_tokens = np.array([candidate])
-            ref_tokens = np.array([reference])
+        cand_tokens = self._split(candidate)
+        ref_tokens = self._split(reference)
 
         if len(cand_tokens) == 0 or len(ref_tokens) == 0:
             return SemanticSimilarityResult(0.0, 0.0, 0.0)
@@ -69,17 +152,56 @@ class SemanticSimilarity:
         cand_embeddings = self._get_embeddings_batch(cand_tokens)
         ref_embeddings = self._get_embeddings_batch(ref_tokens)
 
-        sim_matrix = cosine_similarity(cand_embeddings, ref_embeddings)
+        return self._score(cand_embeddings, ref_embeddings)
 
-        precisions = np.max(sim_matrix, axis=1)
-        recalls = np.max(sim_matrix, axis=0)
+    async def acompute_similarity(
+        self, candidate: Any, reference: Any
+    ) -> SemanticSimilarityResult:
+        if not candidate or not reference:
+            return SemanticSimilarityResult(0.0, 0.0, 0.0)
+        cand_tokens = self._split(candidate)
+        ref_tokens = self._split(reference)
 
-        precision = np.mean(precisions)
-        recall = np.mean(recalls)
+        if len(cand_tokens) == 0 or len(ref_tokens) == 0:
+            return SemanticSimilarityResult(0.0, 0.0, 0.0)
 
-        denominator = precision + recall
-        f1 = 2 * precision * recall / denominator if denominator != 0 else 0.0
+        cand_embeddings, ref_embeddings = await asyncio.gather(
+            self._aget_embeddings_batch(cand_tokens),
+            self._aget_embeddings_batch(ref_tokens),
+        )
 
-        return SemanticSimilarityResult(
-            precision=float(precision), recall=float(recall), f1=float(f1)
+        return self._score(cand_embeddings, ref_embeddings)
+
+    async def acompute_similarity_batch(
+        self, pairs: list[tuple[Any, Any]]
+    ) -> list[SemanticSimilarityResult]:
+        tokens = []
+        for candidate, reference in pairs:
+            if candidate and reference:
+                tokens.extend([self._split(candidate), self._split(reference)])
+            else:
+                tokens.extend([np.array([]), np.array([])])
+
+        lengths = [len(token_array) for token_array in tokens]
+        non_empty_tokens = [token_array for token_array in tokens if len(token_array)]
+        if not non_empty_tokens:
+            return [SemanticSimilarityResult(0.0, 0.0, 0.0) for _ in pairs]
+
+        unique_tokens, inverse_indices = np.unique(
+            np.concatenate(non_empty_tokens), return_inverse=True
         )
+        embeddings_array = await self._aembed_unique(unique_tokens.tolist())
+
+        token_embeddings = np.split(
+            embeddings_array[inverse_indices], np.cumsum(lengths)[:-1]
+        )
+
+        results = []
+        for cand_embeddings, ref_embeddings in zip(
+            token_embeddings[::2], token_embeddings[1::2]
+        ):
+            if len(cand_embeddings) == 0 or len(ref_embeddings) == 0:
+                results.append(SemanticSimilarityResult(0.0, 0.0, 0.0))
+            else:
+                results.append(self._score(cand_embeddings, ref_embeddings))
+        return results
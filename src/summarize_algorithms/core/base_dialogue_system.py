@@ -102,3 +102,17 @@ class BaseDialogueSystem(ABC):
             self.completion_tokens += cb.completion_tokens
             self.total_cost += cb.total_cost
         return self.state if self.state is not None else initial_state
+
+    async def aprocess_dialogue(
+        self, sessions: list[Session], query: str
+    ) -> DialogueState:
+        initial_state = self._get_initial_state(sessions, query)
+        with get_openai_callback() as cb:
+            self.state = self._get_dialogue_state_class(
+                **await self.graph.ainvoke(initial_state)
+            )
+
+            self.prompt_tokens += cb.prompt_tokens
+            self.completion_tokens += cb.completion_tokens
+            self.total_cost += cb.total_cost
+        return self.state if self.state is not None else initial_state
@@ -5,12 +5,15 @@ from langchain_core.language_models import BaseChatModel
 from langchain_core.prompts import PromptTemplate
 from langchain_core.runnables import Runnable
 
+from src.summarize_algorithms.core.models import BaseBlock
+
 
 class BaseSummarizer(ABC):
     def __init__(self, llm: BaseChatModel, prompt: PromptTemplate) -> None:
         self.llm = llm
         self.prompt = prompt
         self.chain = self._build_chain()
+        self._summary_cache: dict[tuple[tuple[str, Any], ...], list[BaseBlock]] = {}
 
     @abstractmethod
     def _build_chain(self) -> Runnable[dict[str, Any], Any]:
@@ -19,3 +22,13 @@ class BaseSummarizer(ABC):
     @abstractmethod
     def summarize(self, *args: Any, **kwargs: Any) -> Any:
         pass
+
+    def _invoke_chain(self, params: dict[str, Any]) -> list[BaseBlock]:
+        key = tuple(sorted(params.items()))
+        if key not in self._summary_cache:
+            try:
+                response = self.chain.invoke(params)
+            except Exception as e:
+                raise ConnectionError(f"API request failed: {e}") from e
+            self._summary_cache[key] = response.summary_messages
+        return list(self._summary_cache[key])
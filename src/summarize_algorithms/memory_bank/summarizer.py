@@ -19,13 +19,9 @@ class SessionSummarizer(BaseSummarizer):
         )
 
     def summarize(self, session_messages: str, session_id: int) -> list[BaseBlock]:
-        try:
-            response = self.chain.invoke(
-                {
-                    "session_messages": session_messages,
-                    "session_id": session_id,
-                }
-            )
-            return response.summary_messages
-        except Exception as e:
-            raise ConnectionError(f"API request failed: {e}") from e
+        return self._invoke_chain(
+            {
+                "session_messages": session_messages,
+                "session_id": session_id,
+            }
+        )
@@ -15,13 +15,9 @@ class RecursiveSummarizer(BaseSummarizer):
         )
 
     def summarize(self, previous_memory: str, dialogue_context: str) -> list[BaseBlock]:
-        try:
-            response = self.chain.invoke(
-                {
-                    "previous_memory": previous_memory,
-                    "dialogue_context": dialogue_context,
-                }
-            )
-            return response.summary_messages
-        except Exception as e:
-            raise ConnectionError(f"API request failed: {e}") from e
+        return self._invoke_chain(
+            {
+                "previous_memory": previous_memory,
+                "dialogue_context": dialogue_context,
+            }
+        )
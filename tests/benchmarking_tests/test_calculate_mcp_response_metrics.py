@@ -0,0 +1,179 @@
+import asyncio
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.benchmarking.calculate_mcp_response_metrics import (
+    CalculateMCPResponseMetrics,
+)
+from src.benchmarking.deserialize_mcp_data import SessionMemory
+from src.benchmarking.llm_evaluation import (
+    ComparisonResult,
+    PairwiseResult,
+    SingleResult,
+)
+from src.benchmarking.semantic_similarity import SemanticSimilarityResult
+from src.summarize_algorithms.core.models import BaseBlock, Session
+
+
+class InFlightTracker:
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def track(self, result):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+        return result
+
+
+class FakeRecsum:
+    def __init__(self, tracker: InFlightTracker) -> None:
+        self.tracker = tracker
+
+    async def aprocess_dialogue(self, sessions, query):
+        return await self.tracker.track(
+            SimpleNamespace(response=f"recsum answer to {query}")
+        )
+
+
+class FakeBaseline:
+    def __init__(self, tracker: InFlightTracker) -> None:
+        self.tracker = tracker
+
+    async def aprocess_dialogue(self, sessions, query):
+        return await self.tracker.track(f"baseline answer to {query}")
+
+
+class FakeLLMScorer:
+    def __init__(self, tracker: InFlightTracker) -> None:
+        self.tracker = tracker
+
+    async def aevaluate_single(self, context, memory, response):
+        score = 80 if response.startswith("recsum") else 40
+        return await self.tracker.track(
+            SingleResult(
+                faithfulness_score=score,
+                informativeness_score=score,
+                coherency_score=score,
+            )
+        )
+
+    async def aevaluate_pairwise(
+        self, context, memory, first_response, second_response
+    ):
+        winner = (
+            ComparisonResult.OPTION_1_BETTER
+            if first_response.startswith("recsum")
+            else ComparisonResult.OPTION_2_BETTER
+        )
+        return await self.tracker.track(
+            PairwiseResult(
+                faithfulness=winner, informativeness=winner, coherency=winner
+            )
+        )
+
+
+def make_dialogue(n_messages: int) -> list[Session]:
+    history = Session([BaseBlock(role="user", content="earlier session")])
+    messages = [
+        BaseBlock(role="user" if i % 2 == 0 else "assistant", content=f"message {i}")
+        for i in range(n_messages)
+    ]
+    return [history, Session(messages)]
+
+
+async def fake_similarity_batch(pairs):
+    return [
+        SemanticSimilarityResult(
+            precision=0.9 if candidate.startswith("recsum") else 0.3,
+            recall=0.8 if candidate.startswith("recsum") else 0.2,
+            f1=0.85 if candidate.startswith("recsum") else 0.25,
+        )
+        for candidate, _ in pairs
+    ]
+
+
+@pytest.fixture
+def tracker():
+    return InFlightTracker()
+
+
+@pytest.fixture
+def make_metrics(tracker):
+    def _make(n_dialogues: int = 6, n_messages: int = 5, **kwargs):
+        module = "src.benchmarking.calculate_mcp_response_metrics"
+        with patch("src.benchmarking.metric_calculator.MCPDataset"), patch(
+            "src.benchmarking.metric_calculator.RecsumDialogueSystem"
+        ), patch(f"{module}.DialogueBaseline"), patch(
+            f"{module}.SemanticSimilarity"
+        ), patch(f"{module}.LLMResponseEvaluation"):
+            metrics = CalculateMCPResponseMetrics(n_dialogues, seed=0, **kwargs)
+
+        metrics.dataset = MagicMock()
+        metrics.dataset.sessions = [
+            make_dialogue(n_messages) for _ in range(n_dialogues)
+        ]
+        metrics.dataset.memory = [
+            [SessionMemory(role1="user", role2="assistant", memory1=["fact"])]
+            for _ in range(n_dialogues)
+        ]
+        metrics.recsum = FakeRecsum(tracker)
+        metrics.baseline = FakeBaseline(tracker)
+        metrics.llm_scorer = FakeLLMScorer(tracker)
+        metrics.semantic_scorer = MagicMock()
+        metrics.semantic_scorer.acompute_similarity_batch = fake_similarity_batch
+        return metrics
+
+    return _make
+
+
+def test_llm_concurrency_caps_all_model_calls(make_metrics, tracker):
+    metrics = make_metrics(concurrency=8, llm_concurrency=4)
+
+    metrics.calculate()
+
+    assert 1 < tracker.max_in_flight <= 4
+    assert metrics.results.pairwise_results.get_total_count() == 6 * 4
+
+
+def test_calculate_twice_does_not_double_count(make_metrics):
+    metrics = make_metrics()
+
+    metrics.calculate()
+    first = metrics.results
+    metrics.calculate()
+    second = metrics.results
+
+    assert metrics.message_count == 6 * 4
+    assert second.recsum_results.semantic_f1.count == 6 * 4
+    assert second.baseline_results.llm_coherency.count == 6 * 4
+    assert second.pairwise_results.get_total_count() == 6 * 4
+    assert first.pairwise_results.get_total_count() == 6 * 4
+
+
+def test_semantic_scores_are_batched_once_and_split_by_system(make_metrics):
+    metrics = make_metrics()
+    batches = []
+
+    async def recording_batch(pairs):
+        batches.append(list(pairs))
+        return await fake_similarity_batch(pairs)
+
+    metrics.semantic_scorer.acompute_similarity_batch = recording_batch
+
+    results = metrics.results
+
+    assert len(batches) == 1
+    assert len(batches[0]) == 2 * 6 * 4
+    assert all(candidate.startswith("recsum") for candidate, _ in batches[0][:24])
+    assert all(candidate.startswith("baseline") for candidate, _ in batches[0][24:])
+    assert results.recsum_results.semantic_precision.mean == pytest.approx(0.9)
+    assert results.recsum_results.semantic_recall.mean == pytest.approx(0.8)
+    assert results.baseline_results.semantic_precision.mean == pytest.approx(0.3)
+    assert results.baseline_results.semantic_f1.mean == pytest.approx(0.25)
+    assert results.baseline_results.semantic_f1.count == 6 * 4
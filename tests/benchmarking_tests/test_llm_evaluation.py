@@ -0,0 +1,97 @@
+import asyncio
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from langchain_core.prompts import PromptTemplate
+
+from src.benchmarking.llm_evaluation import (
+    ComparisonResult,
+    LLMResponseEvaluation,
+    PairwiseResult,
+    SingleResult,
+)
+
+
+@pytest.fixture
+def single_result():
+    return SingleResult(
+        faithfulness_score=80, informativeness_score=70, coherency_score=90
+    )
+
+
+@pytest.fixture
+def evaluation(tmp_path):
+    return LLMResponseEvaluation(llm=MagicMock(), cache_dir=str(tmp_path / "cache"))
+
+
+def test_evaluate_single_is_cached(evaluation, single_result):
+    mock_chain = MagicMock()
+    mock_chain.invoke.return_value = single_result
+    evaluation.single_eval_chain = mock_chain
+
+    first = evaluation.evaluate_single("Context", "Memory", "Response")
+    second = evaluation.evaluate_single("Context", "Memory", "Response")
+
+    assert first == second == single_result
+    mock_chain.invoke.assert_called_once_with(
+        {"context": "Context", "memory": "Memory", "response": "Response"}
+    )
+
+
+def test_different_params_miss_cache(evaluation, single_result):
+    mock_chain = MagicMock()
+    mock_chain.invoke.return_value = single_result
+    evaluation.single_eval_chain = mock_chain
+
+    evaluation.evaluate_single("Context", "Memory", "First response")
+    evaluation.evaluate_single("Context", "Memory", "Second response")
+
+    assert mock_chain.invoke.call_count == 2
+
+
+def test_prompt_change_misses_cache(evaluation, single_result):
+    mock_chain = MagicMock()
+    mock_chain.invoke.return_value = single_result
+    evaluation.single_eval_chain = mock_chain
+
+    evaluation.evaluate_single("Context", "Memory", "Response")
+    evaluation.single_eval_prompt = PromptTemplate.from_template(
+        "Rate again: {context} {memory} {response}"
+    )
+    evaluation.evaluate_single("Context", "Memory", "Response")
+
+    assert mock_chain.invoke.call_count == 2
+
+
+def test_async_pairwise_shares_cache(evaluation):
+    pairwise_result = PairwiseResult(
+        faithfulness=ComparisonResult.OPTION_1_BETTER,
+        informativeness=ComparisonResult.DRAW,
+        coherency=ComparisonResult.OPTION_2_BETTER,
+    )
+    mock_chain = MagicMock()
+    mock_chain.invoke.return_value = pairwise_result
+    mock_chain.ainvoke = AsyncMock()
+    evaluation.pairwise_eval_chain = mock_chain
+
+    evaluation.evaluate_pairwise("Context", "Memory", "First", "Second")
+    result = asyncio.run(
+        evaluation.aevaluate_pairwise("Context", "Memory", "First", "Second")
+    )
+
+    assert result == pairwise_result
+    mock_chain.ainvoke.assert_not_called()
+
+
+def test_cache_disabled(single_result):
+    evaluation = LLMResponseEvaluation(llm=MagicMock(), cache_dir=None)
+    mock_chain = MagicMock()
+    mock_chain.invoke.return_value = single_result
+    evaluation.single_eval_chain = mock_chain
+
+    evaluation.evaluate_single("Context", "Memory", "Response")
+    evaluation.evaluate_single("Context", "Memory", "Response")
+
+    assert mock_chain.invoke.call_count == 2
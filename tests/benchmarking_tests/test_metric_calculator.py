@@ -0,0 +1,165 @@
+from dataclasses import asdict
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.benchmarking.llm_evaluation import SingleResult
+from src.benchmarking.metric_calculator import (
+    CalculateMCPMetrics,
+    MCPMemoryResults,
+    MCPResponseResults,
+    MetricStats,
+    RawLLMData,
+    RawSemanticData,
+    ScoreBuffer,
+    SystemResults,
+)
+from src.benchmarking.semantic_similarity import SemanticSimilarityResult
+
+
+@pytest.fixture
+def buffer():
+    return ScoreBuffer(capacity=2)
+
+
+def test_empty_buffer(buffer):
+    assert len(buffer) == 0
+    assert buffer.values.shape == (0,)
+
+
+def test_append_grows_past_capacity(buffer):
+    for value in range(5):
+        buffer.append(float(value))
+
+    assert len(buffer) == 5
+    np.testing.assert_array_equal(buffer.values, [0.0, 1.0, 2.0, 3.0, 4.0])
+
+
+def test_extend_after_append(buffer):
+    buffer.append(1.0)
+    buffer.extend(iter([2.0, 3.0, 4.0]))
+
+    np.testing.assert_array_equal(buffer.values, [1.0, 2.0, 3.0, 4.0])
+
+
+def test_from_values_empty():
+    assert MetricStats.from_values(np.array([])) == MetricStats()
+
+
+def test_from_matrix_matches_from_values():
+    values = np.array([[1.0, 2.0, 6.0], [0.5, 0.5, 0.5]])
+
+    stats = MetricStats.from_matrix(values)
+
+    assert stats == [MetricStats.from_values(row) for row in values]
+
+
+def test_system_results_from_raw():
+    semantic_data = RawSemanticData()
+    llm_data = RawLLMData()
+    semantic_data.precision.extend([0.2, 0.4])
+    semantic_data.recall.extend([0.6, 0.8])
+    semantic_data.f1.extend([0.3, 0.5])
+    llm_data.faithfulness.extend([10, 30])
+    llm_data.informativeness.extend([50, 50])
+    llm_data.coherency.extend([0, 100])
+
+    results = SystemResults.from_raw(semantic_data, llm_data)
+
+    assert results.semantic_precision.mean == pytest.approx(0.3)
+    assert results.semantic_recall.max == pytest.approx(0.8)
+    assert results.llm_faithfulness.std == pytest.approx(10.0)
+    assert results.llm_coherency.min == 0.0
+    assert results.llm_informativeness.count == 2
+
+
+def test_raw_data_add_scores():
+    semantic_data = RawSemanticData()
+    llm_data = RawLLMData()
+
+    semantic_data.add(SemanticSimilarityResult(precision=0.1, recall=0.2, f1=0.3))
+    semantic_data.extend([SemanticSimilarityResult(precision=0.4, recall=0.5, f1=0.6)])
+    llm_data.add(
+        SingleResult(
+            faithfulness_score=10, informativeness_score=20, coherency_score=30
+        )
+    )
+
+    np.testing.assert_array_equal(semantic_data.precision.values, [0.1, 0.4])
+    np.testing.assert_array_equal(semantic_data.recall.values, [0.2, 0.5])
+    np.testing.assert_array_equal(semantic_data.f1.values, [0.3, 0.6])
+    np.testing.assert_array_equal(llm_data.faithfulness.values, [10.0])
+    np.testing.assert_array_equal(llm_data.informativeness.values, [20.0])
+    np.testing.assert_array_equal(llm_data.coherency.values, [30.0])
+
+
+def test_system_results_from_empty_raw():
+    results = SystemResults.from_raw(RawSemanticData(), RawLLMData())
+
+    assert results == SystemResults()
+
+
+@pytest.mark.parametrize("results_class", [MCPResponseResults, MCPMemoryResults])
+def test_to_dict_matches_asdict(results_class):
+    results = results_class(
+        metadata={"n_samples": 1},
+        recsum_results=SystemResults(semantic_f1=MetricStats(mean=0.5, count=1)),
+    )
+    results.pairwise_results.coherency["draw"] = 1
+
+    assert results.to_dict() == asdict(results)
+
+
+class StubMetrics(CalculateMCPMetrics):
+    def __init__(self) -> None:
+        with patch("src.benchmarking.metric_calculator.MCPDataset"), patch(
+            "src.benchmarking.metric_calculator.RecsumDialogueSystem"
+        ):
+            super().__init__(n_samples=1)
+        self.calculate_calls = 0
+        self.build_calls = 0
+
+    def calculate(self) -> None:
+        self._reset_scores()
+        self.calculate_calls += 1
+        self._recsum_semantic_data.add(
+            SemanticSimilarityResult(precision=0.5, recall=0.5, f1=0.5)
+        )
+        self._pairwise_dicts[0]["draw"] += 1
+        self._is_calculated = True
+
+    def _build_results(self) -> MCPResponseResults:
+        self.build_calls += 1
+        return MCPResponseResults(
+            recsum_results=SystemResults(
+                semantic_f1=MetricStats.from_values(
+                    self._recsum_semantic_data.f1.values
+                )
+            ),
+            pairwise_results=self._pairwise_data,
+        )
+
+
+def test_results_are_memoized():
+    metrics = StubMetrics()
+
+    first = metrics.results
+    second = metrics.results
+
+    assert first is second
+    assert metrics.calculate_calls == 1
+    assert metrics.build_calls == 1
+
+
+def test_recalculation_invalidates_results():
+    metrics = StubMetrics()
+
+    first = metrics.results
+    metrics.calculate()
+
+    assert metrics.results is not first
+    assert metrics.build_calls == 2
+    assert metrics.results.recsum_results.semantic_f1.count == 1
+    assert metrics.results.pairwise_results.get_total_count() == 1
+    assert first.pairwise_results.get_total_count() == 1
@@ -0,0 +1,137 @@
+import asyncio
+
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.benchmarking.semantic_similarity import SemanticSimilarity
+
+VECTORS = {
+    "a": [1.0, 0.0, 0.0],
+    "b": [0.0, 1.0, 0.0],
+    "c": [0.0, 0.0, 1.0],
+    "p": [1.0, 1.0, 0.0],
+    "q": [0.0, 1.0, 1.0],
+    "x": [1.0, 0.0, 1.0],
+}
+
+
+class WordTokenizer:
+    def __init__(self) -> None:
+        self.vocabulary: list[str] = []
+
+    def encode(self, text: str) -> list[int]:
+        token_ids = []
+        for word in text.split():
+            if word not in self.vocabulary:
+                self.vocabulary.append(word)
+            token_ids.append(self.vocabulary.index(word))
+        return token_ids
+
+    def decode(self, token_ids: list[int]) -> str:
+        return " ".join(self.vocabulary[token_id] for token_id in token_ids)
+
+
+class FixedEmbeddings:
+    def __init__(self) -> None:
+        self.requests: list[list[str]] = []
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.requests.append(list(texts))
+        return [VECTORS[text] for text in texts]
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        await asyncio.sleep(0.01 if "a" in texts else 0)
+        return self.embed_documents(texts)
+
+
+@pytest.fixture
+def make_similarity():
+    def _make(**kwargs):
+        kwargs.setdefault("use_tokenizer", False)
+        with patch("src.benchmarking.semantic_similarity.OpenAIEmbeddings"), patch(
+            "src.benchmarking.semantic_similarity.tiktoken.get_encoding",
+            return_value=WordTokenizer(),
+        ):
+            similarity = SemanticSimilarity(**kwargs)
+        similarity.embeddings = FixedEmbeddings()
+        return similarity
+
+    return _make
+
+
+def test_eviction_during_await_keeps_cached_vectors(make_similarity):
+    similarity = make_similarity(cache_size=2)
+    similarity.compute_similarity(["x"], ["x"])
+
+    result = asyncio.run(similarity.acompute_similarity(["a", "x"], ["p", "q"]))
+
+    expected = similarity.compute_similarity(["a", "x"], ["p", "q"])
+    assert result.precision == pytest.approx(expected.precision)
+    assert result.recall == pytest.approx(expected.recall)
+    assert result.f1 == pytest.approx(expected.f1)
+
+
+def test_cached_tokens_are_not_requested_again(make_similarity):
+    similarity = make_similarity()
+
+    similarity.compute_similarity(["a", "b"], ["c"])
+    similarity.compute_similarity(["a"], ["c", "p"])
+
+    assert similarity.embeddings.requests == [["a", "b"], ["c"], ["p"]]
+    np.testing.assert_allclose(
+        np.linalg.norm(similarity._embedding_cache["p"]), 1.0, rtol=1e-6
+    )
+
+
+def assert_same_scores(actual, expected):
+    assert len(actual) == len(expected)
+    for actual_score, expected_score in zip(actual, expected):
+        assert actual_score.precision == pytest.approx(expected_score.precision)
+        assert actual_score.recall == pytest.approx(expected_score.recall)
+        assert actual_score.f1 == pytest.approx(expected_score.f1)
+
+
+def test_batch_matches_per_pair_scores(make_similarity):
+    pairs = [
+        ("a b", "c p"),
+        ("", "a"),
+        ("   ", "b"),
+        ("x q x", "x"),
+        ("a", ""),
+        ("p", "q a"),
+    ]
+    batch_similarity = make_similarity(use_tokenizer=True)
+    pair_similarity = make_similarity(use_tokenizer=True)
+
+    scores = asyncio.run(batch_similarity.acompute_similarity_batch(pairs))
+
+    expected = [pair_similarity.compute_similarity(*pair) for pair in pairs]
+    assert_same_scores(scores, expected)
+    assert [scores[i].f1 for i in (1, 2, 4)] == [0.0, 0.0, 0.0]
+    assert batch_similarity.embeddings.requests == [["a", "b", "c", "p", "q", "x"]]
+
+
+def test_batch_without_tokenizer_matches_per_pair_scores(make_similarity):
+    pairs = [(["a", "b"], ["c"]), ([], ["a"]), (["x", "q"], ["p", "x"])]
+    batch_similarity = make_similarity()
+    pair_similarity = make_similarity()
+
+    scores = asyncio.run(batch_similarity.acompute_similarity_batch(pairs))
+
+    assert_same_scores(
+        scores, [pair_similarity.compute_similarity(*pair) for pair in pairs]
+    )
+
+
+def test_batch_of_empty_pairs(make_similarity):
+    similarity = make_similarity(use_tokenizer=True)
+
+    scores = asyncio.run(similarity.acompute_similarity_batch([("", "a"), (" ", "")]))
+
+    assert [(score.precision, score.recall, score.f1) for score in scores] == [
+        (0.0, 0.0, 0.0),
+        (0.0, 0.0, 0.0),
+    ]
+    assert similarity.embeddings.requests == []
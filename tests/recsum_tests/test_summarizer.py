@@ -72,3 +72,16 @@ def test_argument_passing(summarizer, memory, context):
     mock_chain.invoke.assert_called_once_with(
         {"previous_memory": memory, "dialogue_context": context}
     )
+
+
+def test_summarize_reuses_identical_calls(summarizer):
+    mock_chain = MagicMock()
+    mock_chain.invoke.return_value = FragmentMemory(["Summary"])
+    summarizer.chain = mock_chain
+
+    first = summarizer.summarize("Memory", "Context")
+    second = summarizer.summarize("Memory", "Context")
+    summarizer.summarize("Memory", "Other context")
+
+    assert first == second == ["Summary"]
+    assert mock_chain.invoke.call_count == 2